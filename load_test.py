@@ -0,0 +1,418 @@
+# Load test for web_app.py
+# Starts the app under gunicorn against a synthetic roster, drives a mixed
+# read/write workload from a pool of client threads and reports:
+# - throughput
+# - p50/p95/p99 latency (overall and per operation)
+# - error counts
+# - lost updates (writes the server acknowledged that are not in the final data)
+#
+# Example:
+#   python load_test.py --workers 4 --clients 16 --duration 20 --students 2000
+#   python load_test.py --mix home=50,search=20,export=5,add=10,edit=10,delete=5
+
+import argparse
+import http.client
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlencode, urlsplit
+
+APP_DIR = Path(__file__).resolve().parent
+
+DEFAULT_MIX = "home=40,search=20,export=5,add=10,edit_form=5,edit=15,delete=5"
+OPERATIONS = ("home", "search", "export", "add", "edit_form", "edit", "delete")
+
+FIRST_NAMES = ["Ali", "Sara", "John", "Mia", "Omar", "Lena", "Ravi", "Chen", "Ana", "Noah"]
+LAST_NAMES = ["Khan", "Smith", "Garcia", "Ito", "Brown", "Ahmed", "Novak", "Silva"]
+DEGREES = ["Computing (AI)", "Computer Science", "Mathematics", "Physics", "Business", "Law", ""]
+
+
+# -------------------------
+# Synthetic roster
+# -------------------------
+def make_student(rng, sid):
+    return {
+        "id": sid,
+        "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+        "age": rng.randint(17, 40),
+        "degree": rng.choice(DEGREES),
+    }
+
+
+def make_roster(count, seed):
+    rng = random.Random(seed)
+    return [make_student(rng, f"S{i:06d}") for i in range(count)]
+
+
+# -------------------------
+# Server management
+# -------------------------
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_server(host, port, timeout=15.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=0.5):
+                return True
+        except OSError:
+            time.sleep(0.1)
+    return False
+
+
+def start_gunicorn(workers, port, data_file, extra_args):
+    env = dict(os.environ, STUDENTS_FILE=str(data_file))
+    cmd = [
+        sys.executable, "-m", "gunicorn",
+        "--workers", str(workers),
+        "--bind", f"127.0.0.1:{port}",
+        "--log-level", "warning",
+        *extra_args,
+        "web_app:app",
+    ]
+    return subprocess.Popen(cmd, cwd=APP_DIR, env=env)
+
+
+def stop_server(proc):
+    proc.terminate()
+    try:
+        proc.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+
+# -------------------------
+# HTTP helpers
+# -------------------------
+def send(host, port, method, path, form=None, timeout=30.0):
+    """Send one request. Returns (status, location header, body bytes)."""
+    conn = http.client.HTTPConnection(host, port, timeout=timeout)
+    try:
+        body = None
+        headers = {}
+        if form is not None:
+            body = urlencode(form)
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+        conn.request(method, path, body=body, headers=headers)
+        resp = conn.getresponse()
+        data = resp.read()
+        return resp.status, resp.getheader("Location", ""), data
+    finally:
+        conn.close()
+
+
+def redirected_ok(status, location):
+    """Write routes redirect to '/' on success and to '/?msg=...' on failure."""
+    return status in (301, 302, 303) and urlsplit(location).query == ""
+
+
+def fetch_roster(host, port):
+    """Read the final server-side state through /export.csv."""
+    status, _, data = send(host, port, "GET", "/export.csv")
+    if status != 200:
+        raise RuntimeError(f"/export.csv returned HTTP {status}")
+    roster = {}
+    for line in data.decode("utf-8").splitlines()[1:]:
+        sid, name, age, degree = line.split(",", 3)
+        roster[sid] = {"id": sid, "name": name, "age": int(age) if age.isdigit() else 0, "degree": degree}
+    return roster
+
+
+# -------------------------
+# Client workload
+# -------------------------
+class Client:
+    """
+    One simulated user. Each client owns a disjoint set of student IDs and is
+    the only one that writes to them, so whatever it last got acknowledged is
+    exactly what the server should end up holding for those IDs.
+    """
+
+    def __init__(self, index, owned, ops, weights, seed):
+        self.index = index
+        self.rng = random.Random(seed)
+        self.ops = ops
+        self.weights = weights
+        self.expected = {s["id"]: dict(s) for s in owned}  # sid -> record, or None once deleted
+        self.alive = [s["id"] for s in owned]
+        self.added = 0
+        self.revision = 0
+        self.samples = []  # (op, seconds, ok)
+        self.lost_in_flight = 0
+
+    def pick_op(self):
+        op = self.rng.choices(self.ops, self.weights)[0]
+        if op in ("edit_form", "edit", "delete") and not self.alive:
+            return "add"
+        return op
+
+    def mark_vanished(self, sid):
+        # Someone else's save dropped a student we own. Keep the expectation so
+        # the final check still counts it, but stop picking it for writes.
+        self.lost_in_flight += 1
+        self.alive.remove(sid)
+
+    def step(self, host, port):
+        op = self.pick_op()
+        start = time.perf_counter()
+        try:
+            ok = getattr(self, f"do_{op}")(host, port)
+        except (OSError, http.client.HTTPException):
+            ok = False
+        self.samples.append((op, time.perf_counter() - start, ok))
+
+    def do_home(self, host, port):
+        status, _, _ = send(host, port, "GET", "/")
+        return status == 200
+
+    def do_search(self, host, port):
+        term = self.rng.choice(FIRST_NAMES + LAST_NAMES + DEGREES[:-1])
+        status, _, _ = send(host, port, "GET", "/?" + urlencode({"q": term}))
+        return status == 200
+
+    def do_export(self, host, port):
+        status, _, _ = send(host, port, "GET", "/export.csv")
+        return status == 200
+
+    def do_add(self, host, port):
+        self.added += 1
+        sid = f"L{self.index:03d}x{self.added:06d}"
+        record = make_student(self.rng, sid)
+        status, location, _ = send(host, port, "POST", "/add", form=record)
+        if not redirected_ok(status, location):
+            return False
+        self.expected[sid] = record
+        self.alive.append(sid)
+        return True
+
+    def do_edit_form(self, host, port):
+        sid = self.rng.choice(self.alive)
+        status, location, _ = send(host, port, "GET", f"/edit/{sid}")
+        if status != 200:
+            # the app redirects here when it cannot find a student we own
+            if location:
+                self.mark_vanished(sid)
+            return False
+        return True
+
+    def do_edit(self, host, port):
+        sid = self.rng.choice(self.alive)
+        self.revision += 1
+        record = dict(self.expected[sid])
+        record["name"] = f"Edited c{self.index} r{self.revision}"
+        record["age"] = self.rng.randint(17, 40)
+        record["degree"] = self.rng.choice(DEGREES)
+        form = {k: record[k] for k in ("name", "age", "degree")}
+        status, location, _ = send(host, port, "POST", f"/edit/{sid}", form=form)
+        if not redirected_ok(status, location):
+            if status in (301, 302, 303):
+                self.mark_vanished(sid)
+            return False
+        self.expected[sid] = record
+        return True
+
+    def do_delete(self, host, port):
+        sid = self.rng.choice(self.alive)
+        status, location, _ = send(host, port, "GET", f"/delete/{sid}")
+        if not redirected_ok(status, location):
+            if status in (301, 302, 303):
+                self.mark_vanished(sid)
+            return False
+        self.expected[sid] = None
+        self.alive.remove(sid)
+        return True
+
+
+def run_client(client, host, port, deadline, max_requests):
+    while time.monotonic() < deadline:
+        if max_requests and len(client.samples) >= max_requests:
+            break
+        client.step(host, port)
+
+
+# -------------------------
+# Reporting
+# -------------------------
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile: the smallest value with at least pct% of samples at or below it."""
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, max(0, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[k]
+
+
+def summarize(samples, elapsed):
+    latencies = sorted(t for _, t, _ in samples)
+    return {
+        "requests": len(samples),
+        "errors": sum(1 for _, _, ok in samples if not ok),
+        "throughput_rps": round(len(samples) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+    }
+
+
+def check_lost_updates(clients, final):
+    missing = stale = resurrected = 0
+    for c in clients:
+        for sid, record in c.expected.items():
+            actual = final.get(sid)
+            if record is None:
+                resurrected += actual is not None
+            elif actual is None:
+                missing += 1
+            elif any(str(actual[k]) != str(record[k]) for k in ("name", "age", "degree")):
+                stale += 1
+    return {
+        "missing": missing,
+        "stale": stale,
+        "resurrected": resurrected,
+        "lost_in_flight": sum(c.lost_in_flight for c in clients),
+        "total": missing + stale + resurrected,
+    }
+
+
+def build_report(clients, final, elapsed, settings):
+    samples = [s for c in clients for s in c.samples]
+    per_op = {}
+    for op in OPERATIONS:
+        op_samples = [s for s in samples if s[0] == op]
+        if op_samples:
+            per_op[op] = summarize(op_samples, elapsed)
+    return {
+        "settings": settings,
+        "elapsed_s": round(elapsed, 2),
+        "overall": summarize(samples, elapsed),
+        "operations": per_op,
+        "lost_updates": check_lost_updates(clients, final),
+        "final_roster_size": len(final),
+    }
+
+
+def print_report(report):
+    s = report["settings"]
+    print(f"\nServer: {s['server']} | clients: {s['clients']} | roster: {s['students']} | "
+          f"elapsed: {report['elapsed_s']}s")
+    header = f"{'operation':<10} {'reqs':>7} {'errors':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+    print(header)
+    print("-" * len(header))
+    rows = list(report["operations"].items()) + [("TOTAL", report["overall"])]
+    for op, r in rows:
+        print(f"{op:<10} {r['requests']:>7} {r['errors']:>7} {r['throughput_rps']:>8} "
+              f"{r['p50_ms']:>8} {r['p95_ms']:>8} {r['p99_ms']:>8}")
+
+    lost = report["lost_updates"]
+    print(f"\nLost updates: {lost['total']} "
+          f"(missing: {lost['missing']}, stale: {lost['stale']}, resurrected: {lost['resurrected']}) | "
+          f"writes that hit a vanished student: {lost['lost_in_flight']}")
+    print(f"Final roster size: {report['final_roster_size']}")
+
+
+# -------------------------
+# CLI
+# -------------------------
+def parse_mix(text):
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"unknown operation {name!r} (choose from {', '.join(OPERATIONS)})")
+        try:
+            mix[name] = float(weight)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"bad weight for {name!r}: {weight!r}")
+    if not any(w > 0 for w in mix.values()):
+        raise argparse.ArgumentTypeError("mix needs at least one positive weight")
+    return mix
+
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description="Mixed read/write load test for web_app.py")
+    p.add_argument("--workers", type=int, default=2, help="gunicorn worker processes (default 2)")
+    p.add_argument("--clients", type=int, default=8, help="concurrent client threads (default 8)")
+    p.add_argument("--duration", type=float, default=10.0, help="seconds to run (default 10)")
+    p.add_argument("--requests", type=int, default=0, help="stop each client after this many requests (0 = no cap)")
+    p.add_argument("--students", type=int, default=500, help="size of the synthetic roster (default 500)")
+    p.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX),
+                   help=f"operation weights (default {DEFAULT_MIX})")
+    p.add_argument("--seed", type=int, default=1, help="random seed (default 1)")
+    p.add_argument("--port", type=int, default=0, help="port for gunicorn (default: a free port)")
+    p.add_argument("--gunicorn-arg", action="append", default=[],
+                   help="extra argument passed to gunicorn, repeatable (e.g. --gunicorn-arg=--threads=4)")
+    p.add_argument("--json", metavar="FILE", help="also write the report as JSON to FILE")
+    return p.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.clients < 1 or args.workers < 1:
+        print("--clients and --workers must be at least 1.")
+        return 2
+
+    roster = make_roster(args.students, args.seed)
+    ops = [op for op, w in args.mix.items() if w > 0]
+    weights = [args.mix[op] for op in ops]
+    clients = [
+        Client(i, roster[i::args.clients], ops, weights, seed=args.seed * 1000 + i)
+        for i in range(args.clients)
+    ]
+
+    host = "127.0.0.1"
+    port = args.port or free_port()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = Path(tmp) / "students.json"
+        data_file.write_text(json.dumps(roster, indent=2), encoding="utf-8")
+
+        proc = start_gunicorn(args.workers, port, data_file, args.gunicorn_arg)
+        try:
+            if not wait_for_server(host, port):
+                print("gunicorn did not start (is it installed? pip install -r requirements.txt)")
+                return 1
+
+            start = time.monotonic()
+            deadline = start + args.duration
+            with ThreadPoolExecutor(max_workers=args.clients) as pool:
+                futures = [pool.submit(run_client, c, host, port, deadline, args.requests) for c in clients]
+                for f in futures:
+                    f.result()
+            elapsed = time.monotonic() - start
+
+            final = fetch_roster(host, port)
+        finally:
+            stop_server(proc)
+
+    settings = {
+        "server": f"gunicorn --workers {args.workers} {' '.join(args.gunicorn_arg)}".strip(),
+        "clients": args.clients,
+        "students": args.students,
+        "duration_s": args.duration,
+        "mix": args.mix,
+        "seed": args.seed,
+    }
+    report = build_report(clients, final, elapsed, settings)
+    print_report(report)
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Report written to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,23 @@
+# Where roster files live. Shared by web_app.py and student_management.py so
+# both always read and write the same files.
+# - STUDENTS_FILE: the default roster (students.json next to this file)
+# - STUDENTS_ROSTER_DIR: folder for named rosters (rosters/ next to the default roster)
+
+import os
+import re
+from pathlib import Path
+
+DATA_FILE = Path(os.environ.get("STUDENTS_FILE") or Path(__file__).with_name("students.json"))
+
+# Named rosters (one per class/term) live next to the default roster as <name>.json
+ROSTER_DIR = Path(os.environ.get("STUDENTS_ROSTER_DIR") or DATA_FILE.with_name("rosters"))
+ROSTER_NAME_RE = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+def is_roster_name(name):
+    return bool(ROSTER_NAME_RE.match(name))
+
+
+def roster_path(roster=""):
+    """File of a named roster, or of the default roster when no name is given."""
+    return ROSTER_DIR / f"{roster}.json" if roster else DATA_FILE
@@ -4,11 +4,16 @@
 # - Prevent duplicate IDs
 # - Save/load data to a JSON file automatically
 # - Input validation + clean menu
+# - Optional roster name (python student_management.py fall-2026) for one file per class/term
 
 import json
+import os
+import sys
 from typing import List, Dict, Optional
 
-DATA_FILE = "students.json"
+from roster_paths import is_roster_name, roster_path
+
+DATA_FILE = str(roster_path())
 students: List[Dict[str, object]] = []
 
 
@@ -34,11 +39,14 @@ def load_students() -> None:
     except FileNotFoundError:
         students = []
     except json.JSONDecodeError:
-        print("Warning: students.json is corrupted. Starting with an empty list.")
+        print(f"Warning: {DATA_FILE} is corrupted. Starting with an empty list.")
         students = []
 
 
 def save_students() -> None:
+    folder = os.path.dirname(DATA_FILE)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
     with open(DATA_FILE, "w", encoding="utf-8") as f:
         json.dump(students, f, indent=2)
 
@@ -170,7 +178,19 @@ def delete_student() -> None:
         print("Delete cancelled.")
 
 
+def select_roster(name: str) -> bool:
+    global DATA_FILE
+    if not is_roster_name(name):
+        return False
+    DATA_FILE = str(roster_path(name))
+    return True
+
+
 def main() -> None:
+    if len(sys.argv) > 1 and not select_roster(sys.argv[1]):
+        print("Roster names may only use letters, digits, '-' and '_'.")
+        return
+
     load_students()
 
     while True:
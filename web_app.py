@@ -1,26 +1,211 @@
-from flask import Flask, request, redirect, Response
+from flask import Flask, request, redirect, Response, abort
 import json
-from pathlib import Path
+import os
+import re
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+
+from roster_paths import is_roster_name, roster_path
 
 app = Flask(__name__)
-DATA_FILE = Path(__file__).with_name("students.json")
+
+# Bounds for the in-memory roster cache (least recently used rosters are evicted first)
+MAX_CACHED_ROSTERS = int(os.environ.get("MAX_CACHED_ROSTERS", "8"))
+MAX_CACHED_BYTES = int(os.environ.get("MAX_CACHED_BYTES", str(64 * 1024 * 1024)))
 
 
 # -------------------------
-# Data helpers
+# Roster storage
 # -------------------------
-def load_students():
-    if DATA_FILE.exists():
+def roster_prefix(roster=""):
+    """URL prefix for links and redirects inside a roster ("" for the default one)."""
+    return f"/r/{roster}" if roster else ""
+
+
+def resolve_roster(roster=None):
+    """Roster name from the /r/<roster>/ prefix or the ?roster= parameter."""
+    name = (roster or request.values.get("roster", "")).strip()
+    if name and not is_roster_name(name):
+        abort(404)
+    return name
+
+
+def stat_stamp(st):
+    # Saves replace the file with a new inode, so the inode alone tells versions apart
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def file_stamp(path):
+    try:
+        return stat_stamp(path.stat())
+    except FileNotFoundError:
+        return None
+
+
+def read_roster_file(path):
+    if path.exists():
         try:
-            data = json.loads(DATA_FILE.read_text(encoding="utf-8"))
+            data = json.loads(path.read_text(encoding="utf-8"))
             return data if isinstance(data, list) else []
         except json.JSONDecodeError:
             return []
     return []
 
 
-def save_students(students):
-    DATA_FILE.write_text(json.dumps(students, indent=2), encoding="utf-8")
+def estimate_size(students):
+    """Rough memory footprint of a roster in bytes (list + dicts + field values)."""
+    size = sys.getsizeof(students)
+    for s in students:
+        size += sys.getsizeof(s) + sum(sys.getsizeof(v) for v in s.values())
+    return size
+
+
+class Roster:
+    """
+    One loaded roster: its students plus the HTML fragments rendered from them.
+
+    The file stamp is the roster's revision. A save or reload creates a new
+    Roster, which takes over the rendered rows of every record that did not
+    change, so only edited or added students are rendered again.
+    """
+
+    def __init__(self, name, stamp, students):
+        self.name = name
+        self.stamp = stamp
+        self.students = students
+        self.base = roster_prefix(name)
+        # id(record) -> rendered <tr>. Records are never modified in place and
+        # self.students keeps them alive, so their ids are stable keys.
+        self.rows = {}
+        self.page = None  # (stats, degree chart, degree rows, student rows) of the unfiltered view
+        self.data_bytes = estimate_size(students)
+        self.fragment_bytes = 0
+
+    @property
+    def size(self):
+        return self.data_bytes + self.fragment_bytes
+
+    def reuse_rows(self, previous):
+        """Take over rendered rows from an older revision where the record is unchanged."""
+        if not previous.rows:
+            return
+        old_rows = {}
+        for s in previous.students:
+            row = previous.rows.get(id(s))
+            if row is not None:
+                old_rows[str(s.get("id", ""))] = (s, row)
+
+        for s in self.students:
+            old = old_rows.get(str(s.get("id", "")))
+            if old is not None and (old[0] is s or old[0] == s):
+                self.rows[id(s)] = old[1]
+                self.fragment_bytes += sys.getsizeof(old[1])
+
+
+class RosterCache:
+    """
+    Keeps the most recently used rosters in memory.
+
+    Entries are checked against the file's stamp (inode/mtime/size) on every
+    access, so a roster rewritten by another gunicorn worker is simply reloaded.
+    Rosters are evicted oldest-first once either the count or the byte budget
+    (students plus rendered fragments) is exceeded; the roster that was just
+    used is always kept.
+    """
+
+    def __init__(self, max_rosters, max_bytes):
+        self.max_rosters = max_rosters
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries = OrderedDict()  # name -> (roster, accounted size)
+        self._lock = threading.Lock()
+
+    def get(self, name):
+        path = roster_path(name)
+        stamp = file_stamp(path)
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None and entry[0].stamp == stamp:
+                self._entries.move_to_end(name)
+                return entry[0]
+
+        roster = Roster(name, stamp, read_roster_file(path))
+        self.put(roster)
+        return roster
+
+    def put(self, roster):
+        with self._lock:
+            previous = self._entries.get(roster.name)
+        if previous is not None:
+            roster.reuse_rows(previous[0])
+
+        with self._lock:
+            old = self._entries.pop(roster.name, None)
+            if old is not None:
+                self.total_bytes -= old[1]
+            self._entries[roster.name] = (roster, roster.size)
+            self.total_bytes += roster.size
+            self._evict()
+
+    def update_size(self, roster):
+        """Account for fragments rendered since the roster was cached."""
+        with self._lock:
+            entry = self._entries.get(roster.name)
+            if entry is None or entry[0] is not roster:
+                return
+            self.total_bytes += roster.size - entry[1]
+            self._entries[roster.name] = (roster, roster.size)
+            self._evict()
+
+    def _evict(self):
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_rosters or self.total_bytes > self.max_bytes
+        ):
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self.total_bytes -= evicted_size
+
+
+roster_cache = RosterCache(MAX_CACHED_ROSTERS, MAX_CACHED_BYTES)
+
+
+# -------------------------
+# Data helpers
+# -------------------------
+def load_roster(roster=""):
+    return roster_cache.get(roster)
+
+
+def load_students(roster=""):
+    """
+    Students of a roster. The list and its records are shared with the cache,
+    so treat them as read-only: build a new list and pass it to save_students().
+    """
+    return load_roster(roster).students
+
+
+def save_students(students, roster=""):
+    path = roster_path(roster)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    mode = path.stat().st_mode & 0o777 if path.exists() else 0o644
+
+    # Write a temp file and rename it into place. The stamp is taken from the
+    # temp file itself, so it always belongs to the data we wrote, even if
+    # another worker replaces the roster right after us.
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(json.dumps(students, indent=2))
+            f.flush()
+            stamp = stat_stamp(os.fstat(f.fileno()))
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+    roster_cache.put(Roster(roster, stamp, students))
 
 
 def find_by_id(students, sid: str):
@@ -31,10 +216,16 @@ def find_by_id(students, sid: str):
     return None
 
 
+_html_special = re.compile(r"[&<>\"']").search
+
+
 def h(text):
-    """Tiny HTML escape"""
+    """Tiny HTML escape (most fields have nothing to escape, so check first)"""
+    s = str(text)
+    if _html_special(s) is None:
+        return s
     return (
-        str(text)
+        s
         .replace("&", "&amp;")
         .replace("<", "&lt;")
         .replace(">", "&gt;")
@@ -246,28 +437,30 @@ def layout(title, content, msg=""):
 
 
 # -------------------------
-# Routes
+# Fragment cache
 # -------------------------
-@app.get("/")
-def home():
-    students = load_students()
-
-    q = request.args.get("q", "").strip().lower()
-    if q:
-        students = [
-            s for s in students
-            if q in str(s.get("id", "")).lower()
-            or q in str(s.get("name", "")).lower()
-            or q in str(s.get("degree", "")).lower()
-        ]
+def render_student_row(base, s):
+    sid = h(s.get("id", ""))
+    return f"""
+        <tr>
+          <td><span class="badge">{sid}</span></td>
+          <td>{h(s.get("name",""))}</td>
+          <td>{h(s.get("age",""))}</td>
+          <td>{h(s.get("degree",""))}</td>
+          <td>
+            <div class="actions">
+              <a class="btn primary" href="{base}/edit/{sid}">Edit</a>
+              <a class="btn danger" href="{base}/delete/{sid}" onclick="return confirm('Delete this student?')">Delete</a>
+            </div>
+          </td>
+        </tr>
+        """
 
-    stats = compute_stats(students)
-    msg = request.args.get("msg", "").strip()
 
-    # Build degree chart (bars)
-    max_count = max([c for _, c in stats["degrees"]], default=1)
+def render_degree_chart(degrees):
+    max_count = max([c for _, c in degrees], default=1)
     chart_rows = ""
-    for deg, count in stats["degrees"]:
+    for deg, count in degrees:
         width = int((count / max_count) * 100) if max_count else 0
         chart_rows += f"""
           <div class="chart-row">
@@ -276,39 +469,82 @@ def home():
             <div class="chart-count">{count}</div>
           </div>
         """
-    degree_chart = f'<div class="chart">{chart_rows}</div>' if chart_rows else '<div class="muted">No degree data</div>'
+    return f'<div class="chart">{chart_rows}</div>' if chart_rows else '<div class="muted">No degree data</div>'
+
+
+def render_degree_rows(degrees):
+    return "".join(
+        [f"<tr><td>{h(deg)}</td><td>{count}</td></tr>" for deg, count in degrees]
+    ) or "<tr><td colspan='2' class='muted'>No data</td></tr>"
+
 
-    rows = ""
+def render_rows(roster, students):
+    """Student rows of a roster, rendering only records without a cached row."""
+    rows = roster.rows
+    parts = []
     for s in students:
-        sid = h(s.get("id", ""))
-        rows += f"""
-        <tr>
-          <td><span class="badge">{sid}</span></td>
-          <td>{h(s.get("name",""))}</td>
-          <td>{h(s.get("age",""))}</td>
-          <td>{h(s.get("degree",""))}</td>
-          <td>
-            <div class="actions">
-              <a class="btn primary" href="/edit/{sid}">Edit</a>
-              <a class="btn danger" href="/delete/{sid}" onclick="return confirm('Delete this student?')">Delete</a>
-            </div>
-          </td>
-        </tr>
-        """
+        row = rows.get(id(s))
+        if row is None:
+            row = rows[id(s)] = render_student_row(roster.base, s)
+            roster.fragment_bytes += sys.getsizeof(row)
+        parts.append(row)
+    return "".join(parts)
+
+
+def render_page(roster):
+    """Stats and fragments of the unfiltered view, built once per roster revision."""
+    if roster.page is None:
+        stats = compute_stats(roster.students)
+        page = (
+            stats,
+            render_degree_chart(stats["degrees"]),
+            render_degree_rows(stats["degrees"]),
+            render_rows(roster, roster.students),
+        )
+        roster.fragment_bytes += sum(sys.getsizeof(part) for part in page[1:])
+        roster.page = page
+    return roster.page
+
+
+# -------------------------
+# Routes
+# -------------------------
+@app.get("/")
+@app.get("/r/<roster>/")
+def home(roster=None):
+    roster = resolve_roster(roster)
+    base = roster_prefix(roster)
+    loaded = load_roster(roster)
+
+    q = request.args.get("q", "").strip().lower()
+    if q:
+        students = [
+            s for s in loaded.students
+            if q in str(s.get("id", "")).lower()
+            or q in str(s.get("name", "")).lower()
+            or q in str(s.get("degree", "")).lower()
+        ]
+        stats = compute_stats(students)
+        degree_chart = render_degree_chart(stats["degrees"])
+        degree_rows = render_degree_rows(stats["degrees"])
+        rows = render_rows(loaded, students)
+    else:
+        stats, degree_chart, degree_rows, rows = render_page(loaded)
+    roster_cache.update_size(loaded)
+
+    msg = request.args.get("msg", "").strip()
 
     if not rows:
         rows = "<tr><td colspan='5' class='muted'>No students found.</td></tr>"
 
-    degree_rows = "".join(
-        [f"<tr><td>{h(deg)}</td><td>{count}</td></tr>" for deg, count in stats["degrees"]]
-    ) or "<tr><td colspan='2' class='muted'>No data</td></tr>"
+    roster_label = f' <span class="badge">Roster: {h(roster)}</span>' if roster else ""
 
     content = f"""
     <div class="grid">
 
       <div class="card">
         <h2>Add Student</h2>
-        <form method="post" action="/add">
+        <form method="post" action="{base}/add">
           <div class="row two">
             <div>
               <label>Student ID (unique)</label>
@@ -339,9 +575,9 @@ def home():
       </div>
 
       <div class="card">
-        <h2>Students</h2>
+        <h2>Students{roster_label}</h2>
 
-        <form method="get" action="/" style="margin-bottom:12px;">
+        <form method="get" action="{base}/" style="margin-bottom:12px;">
           <div class="row two">
             <div>
               <label>Search (Name / ID / Degree)</label>
@@ -349,13 +585,13 @@ def home():
             </div>
             <div style="display:flex; gap:10px; align-items:flex-end;">
               <button class="btn primary" type="submit">Search</button>
-              <a class="btn" href="/">Clear</a>
+              <a class="btn" href="{base}/">Clear</a>
             </div>
           </div>
         </form>
 
         <div class="btns" style="margin-bottom:10px;">
-          <a class="btn ok" href="/export.csv">Export CSV</a>
+          <a class="btn ok" href="{base}/export.csv">Export CSV</a>
         </div>
 
         <div class="row two" style="margin-bottom:12px;">
@@ -400,8 +636,10 @@ def home():
 
 
 @app.get("/export.csv")
-def export_csv():
-    students = load_students()
+@app.get("/r/<roster>/export.csv")
+def export_csv(roster=None):
+    roster = resolve_roster(roster)
+    students = load_students(roster)
     lines = ["id,name,age,degree"]
     for s in students:
         sid = str(s.get("id", "")).replace(",", " ")
@@ -414,13 +652,16 @@ def export_csv():
     return Response(
         csv_data,
         mimetype="text/csv",
-        headers={"Content-Disposition": "attachment; filename=students_export.csv"},
+        headers={"Content-Disposition": f"attachment; filename={roster or 'students'}_export.csv"},
     )
 
 
 @app.post("/add")
-def add():
-    students = load_students()
+@app.post("/r/<roster>/add")
+def add(roster=None):
+    roster = resolve_roster(roster)
+    base = roster_prefix(roster)
+    students = load_students(roster)
 
     sid = request.form.get("id", "").strip()
     name = request.form.get("name", "").strip()
@@ -428,30 +669,33 @@ def add():
     degree = request.form.get("degree", "").strip()
 
     if not sid or not name:
-        return redirect("/?msg=ID+and+Name+are+required")
+        return redirect(f"{base}/?msg=ID+and+Name+are+required")
 
     if find_by_id(students, sid):
-        return redirect("/?msg=Student+ID+already+exists.+Use+a+unique+ID")
+        return redirect(f"{base}/?msg=Student+ID+already+exists.+Use+a+unique+ID")
 
     age = int(age_raw) if age_raw.isdigit() else 0
-    students.append({"id": sid, "name": name, "age": age, "degree": degree})
-    save_students(students)
-    return redirect("/")
+    students = students + [{"id": sid, "name": name, "age": age, "degree": degree}]
+    save_students(students, roster)
+    return redirect(f"{base}/")
 
 
 @app.get("/edit/<sid>")
-def edit_form(sid):
-    students = load_students()
+@app.get("/r/<roster>/edit/<sid>")
+def edit_form(sid, roster=None):
+    roster = resolve_roster(roster)
+    base = roster_prefix(roster)
+    students = load_students(roster)
     s = find_by_id(students, sid)
     if not s:
-        return redirect("/?msg=Student+not+found")
+        return redirect(f"{base}/?msg=Student+not+found")
 
     content = f"""
     <div class="card" style="max-width:720px; margin:0 auto;">
       <h2>Edit Student</h2>
       <p class="muted"><b>ID:</b> {h(sid)}</p>
 
-      <form method="post" action="/edit/{h(sid)}">
+      <form method="post" action="{base}/edit/{h(sid)}">
         <div class="row two">
           <div>
             <label>Name</label>
@@ -472,7 +716,7 @@ def edit_form(sid):
 
         <div class="btns">
           <button class="btn ok" type="submit">Save Changes</button>
-          <a class="btn" href="/">Cancel</a>
+          <a class="btn" href="{base}/">Cancel</a>
         </div>
       </form>
     </div>
@@ -481,33 +725,42 @@ def edit_form(sid):
 
 
 @app.post("/edit/<sid>")
-def edit_save(sid):
-    students = load_students()
+@app.post("/r/<roster>/edit/<sid>")
+def edit_save(sid, roster=None):
+    roster = resolve_roster(roster)
+    base = roster_prefix(roster)
+    students = load_students(roster)
     s = find_by_id(students, sid)
     if not s:
-        return redirect("/?msg=Student+not+found")
+        return redirect(f"{base}/?msg=Student+not+found")
 
     name = request.form.get("name", "").strip()
     age_raw = request.form.get("age", "").strip()
     degree = request.form.get("degree", "").strip()
 
     if not name:
-        return redirect("/?msg=Name+cannot+be+empty")
+        return redirect(f"{base}/?msg=Name+cannot+be+empty")
 
-    s["name"] = name
-    s["age"] = int(age_raw) if age_raw.isdigit() else 0
-    s["degree"] = degree
+    updated = dict(s, name=name, age=int(age_raw) if age_raw.isdigit() else 0, degree=degree)
+    students = [updated if x is s else x for x in students]
 
-    save_students(students)
-    return redirect("/")
+    save_students(students, roster)
+    return redirect(f"{base}/")
 
 
 @app.get("/delete/<sid>")
-def delete(sid):
-    students = load_students()
-    students = [s for s in students if str(s.get("id", "")).strip() != sid.strip()]
-    save_students(students)
-    return redirect("/")
+@app.get("/r/<roster>/delete/<sid>")
+def delete(sid, roster=None):
+    roster = resolve_roster(roster)
+    base = roster_prefix(roster)
+    students = load_students(roster)
+    remaining = [s for s in students if str(s.get("id", "")).strip() != sid.strip()]
+    if len(remaining) == len(students):
+        # nothing to delete: don't write (or create) the roster file
+        return redirect(f"{base}/?msg=Student+not+found")
+
+    save_students(remaining, roster)
+    return redirect(f"{base}/")
 
 
 if __name__ == "__main__":